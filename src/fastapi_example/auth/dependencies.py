@@ -1,13 +1,14 @@
 import logging
-from collections.abc import Callable
+import sys
+from collections.abc import Callable, Sequence
+from contextvars import ContextVar
 from typing import Any
 
-from fastapi import Depends, HTTPException, Request, Security, status
+from fastapi import Depends, HTTPException, Security, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from fastapi_example.auth.oauth_auth import verify_access_token
 from fastapi_example.settings import Settings, get_settings
-from fastapi_example.utils.auth_utils import hash_api_key
 
 logger = logging.getLogger(__name__)
 bearer_scheme = HTTPBearer(auto_error=False)
@@ -16,55 +17,49 @@ bearer_scheme = HTTPBearer(auto_error=False)
 _security_bearer = Security(bearer_scheme)
 _depends_settings = Depends(get_settings)
 
+# Per-request authenticated user, set by authenticate and read via get_current_user
+_user_info: ContextVar[dict[str, Any] | None] = ContextVar("user_info", default=None)
 
-def _check_roles(user_roles: list[str], allowed_roles: list[str] | None) -> None:
-    if allowed_roles and not any(role in user_roles for role in allowed_roles):
+
+def _looks_like_jwt(token: str) -> bool:
+    # Compact JWTs are three base64url segments and the JSON header encodes to "eyJ"
+    return token.startswith("eyJ") and token.count(".") == 2
+
+
+def _check_roles(
+    user_roles: Sequence[str], allowed_roles: frozenset[str] | None
+) -> None:
+    if allowed_roles and allowed_roles.isdisjoint(user_roles):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User does not have required role",
         )
 
 
-def _try_api_key_auth(
-    token: str, settings: Settings, allowed_roles: list[str] | None
-) -> dict[str, Any] | None:
-    hashed_token = hash_api_key(token)
-    user_info = settings.api_keys.get(hashed_token)
+def _try_api_key_auth(token: str, settings: Settings) -> dict[str, Any] | None:
+    key_info = settings.get_api_key_info(token)
 
-    if not user_info:
+    if key_info is None:
         return None
 
-    username = user_info.get("username")
-    roles = user_info.get("roles", [])
-
-    _check_roles(roles, allowed_roles)
-
-    user_data = {
-        "sub": username,
-        "auth_type": "api_key",
-        "roles": roles,
-    }
     logger.info(
         "Authenticated via API key, user: %s, roles: %s",
-        username,
-        roles,
-        extra={"user": username},
+        key_info.username,
+        key_info.roles,
+        extra={"user": key_info.username},
     )
-    return user_data
+    return {"sub": key_info.username, "auth_type": "api_key", "roles": key_info.roles}
 
 
-def _try_oauth_auth(
-    token: str, allowed_roles: list[str] | None
-) -> dict[str, Any] | None:
+def _try_oauth_auth(token: str, settings: Settings) -> dict[str, Any] | None:
     try:
-        payload = verify_access_token(token)
+        payload = verify_access_token(token, settings)
         user_email = payload.get("sub")
 
         if not user_email:
             return None
 
         oauth_roles = payload.get("roles", [])
-        _check_roles(oauth_roles, allowed_roles)
 
         user_data = {
             "sub": user_email,
@@ -87,35 +82,56 @@ def _try_oauth_auth(
         ) from None
 
 
-def create_auth(allowed_roles: list[str] | None = None) -> Callable:
-    async def auth_dependency(
-        request: Request,
-        credentials: HTTPAuthorizationCredentials = _security_bearer,
-        settings: Settings = _depends_settings,
-    ) -> dict[str, Any]:
-        if not credentials or credentials.scheme.lower() != "bearer":
-            raise HTTPException(
-                status_code=status.HTTP_307_TEMPORARY_REDIRECT,
-                detail="Authentication required",
-                headers={"Location": "/static/"},
-            )
-
-        token = credentials.credentials
-
-        user_data = _try_api_key_auth(token, settings, allowed_roles)
-        if user_data:
-            request.state.user_info = user_data
-            return user_data
+def get_current_user() -> dict[str, Any] | None:
+    return _user_info.get()
 
-        user_data = _try_oauth_auth(token, allowed_roles)
-        if user_data:
-            request.state.user_info = user_data
-            return user_data
 
+async def authenticate(
+    credentials: HTTPAuthorizationCredentials = _security_bearer,
+    settings: Settings = _depends_settings,
+) -> dict[str, Any]:
+    # HTTPBearer already returns None for missing or non-bearer schemes
+    if not credentials:
         raise HTTPException(
             status_code=status.HTTP_307_TEMPORARY_REDIRECT,
-            detail="Invalid authentication credentials",
+            detail="Authentication required",
             headers={"Location": "/static/"},
         )
 
+    token = credentials.credentials
+
+    user_data = _try_api_key_auth(token, settings)
+    if user_data:
+        _user_info.set(user_data)
+        return user_data
+
+    if _looks_like_jwt(token):
+        user_data = _try_oauth_auth(token, settings)
+        if user_data:
+            _user_info.set(user_data)
+            return user_data
+
+    raise HTTPException(
+        status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+        detail="Invalid authentication credentials",
+        headers={"Location": "/static/"},
+    )
+
+
+# Shared by every role check so FastAPI resolves credentials once per request
+_depends_authenticate = Depends(authenticate)
+
+
+def create_auth(allowed_roles: list[str] | None = None) -> Callable:
+    # Interned so set membership against interned user roles hits on identity
+    allowed = (
+        frozenset(sys.intern(role) for role in allowed_roles) if allowed_roles else None
+    )
+
+    async def auth_dependency(
+        user_data: dict[str, Any] = _depends_authenticate,
+    ) -> dict[str, Any]:
+        _check_roles(user_data["roles"], allowed)
+        return user_data
+
     return auth_dependency
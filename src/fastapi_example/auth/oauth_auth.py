@@ -1,18 +1,42 @@
+import hashlib
 import logging
-from datetime import UTC, datetime, timedelta
+import time
+from collections.abc import Sequence
+from datetime import timedelta
 from typing import Any
 
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2AuthorizationCodeBearer
 
-from fastapi_example.auth.oauth_providers import OAUTH_PROVIDERS
-from fastapi_example.settings import get_settings
+from fastapi_example.auth.oauth_providers import OAUTH_PROVIDERS, OAuthProvider
+from fastapi_example.settings import Settings, get_settings
 
 logger = logging.getLogger(__name__)
 
+# Bounded cache of permanently rejected tokens (expired, bad signature, malformed)
+# so replayed tokens skip re-verification. Keyed on a digest, not the raw token.
+_FAILED_TOKEN_CACHE_SIZE = 1024
 
-def get_oauth_config() -> dict[str, str]:
+
+class _CachedError:
+    __slots__ = ("detail",)
+
+    def __init__(self, detail: str) -> None:
+        self.detail = detail
+
+
+_failed_tokens: dict[tuple[str, bytes], _CachedError] = {}
+
+
+def _reject_token(cache_key: tuple[str, bytes], detail: str) -> HTTPException:
+    if len(_failed_tokens) >= _FAILED_TOKEN_CACHE_SIZE:
+        _failed_tokens.pop(next(iter(_failed_tokens)))
+    _failed_tokens[cache_key] = _CachedError(detail)
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
+
+
+def get_oauth_config() -> OAuthProvider:
     settings = get_settings()
     provider = settings.oauth_provider
 
@@ -35,33 +59,49 @@ _depends_oauth2_scheme = Depends(oauth2_scheme)
 def create_access_token(
     data: dict[str, Any],
     expires_delta: timedelta | None = None,
-    roles: list[str] | None = None,
+    roles: Sequence[str] | None = None,
+    settings: Settings | None = None,
 ) -> str:
-    settings = get_settings()
+    if settings is None:
+        settings = get_settings()
     to_encode = data.copy()
 
-    expire = datetime.now(UTC) + (
-        expires_delta or timedelta(minutes=settings.oauth_access_token_expire_minutes)
-    )
-    to_encode.update({"exp": expire})
+    if expires_delta is None:
+        expires_in = settings.oauth_access_token_expire_minutes * 60
+    else:
+        expires_in = int(expires_delta.total_seconds())
+    to_encode["exp"] = int(time.time()) + expires_in
 
     if roles:
-        to_encode["roles"] = roles
+        to_encode["roles"] = list(roles)
 
     return jwt.encode(to_encode, settings.oauth_secret_key, algorithm="HS256")
 
 
-def verify_access_token(token: str) -> dict[str, Any]:
-    settings = get_settings()
+def verify_access_token(token: str, settings: Settings | None = None) -> dict[str, Any]:
+    if settings is None:
+        settings = get_settings()
+    cache_key = (
+        settings.oauth_secret_key,
+        hashlib.blake2b(token.encode(), digest_size=16).digest(),
+    )
+    cached = _failed_tokens.get(cache_key)
+    if cached is not None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=cached.detail,
+        )
+
     try:
         payload = jwt.decode(token, settings.oauth_secret_key, algorithms=["HS256"])
         return payload
     except jwt.ExpiredSignatureError as exc:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token has expired",
-        ) from exc
+        raise _reject_token(cache_key, "Token has expired") from exc
+    except jwt.DecodeError as exc:
+        # Also covers InvalidSignatureError; neither can become valid later
+        raise _reject_token(cache_key, "Invalid token") from exc
     except jwt.InvalidTokenError as exc:
+        # Not cached: e.g. a not-yet-valid (nbf/iat) token may be accepted later
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
@@ -1,14 +1,28 @@
-OAUTH_PROVIDERS = {
-    "github": {
-        "authorization_url": "https://github.com/login/oauth/authorize",
-        "token_url": "https://github.com/login/oauth/access_token",
-        "userinfo_url": "https://api.github.com/user",
-        "scope": "user:email",
-    },
-    "google": {
-        "authorization_url": "https://accounts.google.com/o/oauth2/v2/auth",
-        "token_url": "https://oauth2.googleapis.com/token",
-        "userinfo_url": "https://www.googleapis.com/oauth2/v2/userinfo",
-        "scope": "openid email profile",
-    },
-}
+from dataclasses import dataclass
+from types import MappingProxyType
+
+
+@dataclass(slots=True, frozen=True)
+class OAuthProvider:
+    authorization_url: str
+    token_url: str
+    userinfo_url: str
+    scope: str
+
+
+OAUTH_PROVIDERS = MappingProxyType(
+    {
+        "github": OAuthProvider(
+            authorization_url="https://github.com/login/oauth/authorize",
+            token_url="https://github.com/login/oauth/access_token",
+            userinfo_url="https://api.github.com/user",
+            scope="user:email",
+        ),
+        "google": OAuthProvider(
+            authorization_url="https://accounts.google.com/o/oauth2/v2/auth",
+            token_url="https://oauth2.googleapis.com/token",
+            userinfo_url="https://www.googleapis.com/oauth2/v2/userinfo",
+            scope="openid email profile",
+        ),
+    }
+)
@@ -1,4 +1,6 @@
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import Depends, FastAPI
@@ -11,15 +13,25 @@ from fastapi_example.custom_logger.setup.setup_logger import setup_logging
 from fastapi_example.routers.math import math_router
 from fastapi_example.routers.oauth import oauth_router
 from fastapi_example.settings import get_settings
+from fastapi_example.workers.oauth_service import close_http_client, get_http_client
 
 settings = get_settings()
 setup_logging()
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    get_http_client()
+    yield
+    await close_http_client()
+
+
 app = FastAPI(
     title=settings.app_name,
     version="1.0",
     description=settings.description,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -39,7 +51,7 @@ if static_dir.exists():
 
 
 @app.get("/")
-def root() -> RedirectResponse:
+async def root() -> RedirectResponse:
     return RedirectResponse(url="/static/index.html")
 
 
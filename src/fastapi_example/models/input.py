@@ -1,6 +1,23 @@
+from enum import StrEnum
+from typing import TypedDict
+
 from pydantic import BaseModel
 
 
 class InputData(BaseModel):
     A: float
     B: float
+
+
+class MathOperation(StrEnum):
+    add = "add"
+    subtract = "subtract"
+    multiply = "multiply"
+    divide = "divide"
+
+
+class MathResult(TypedDict):
+    operation: str
+    a: float
+    b: float
+    result: float
@@ -1,8 +1,10 @@
 import logging
+from collections.abc import Callable
 
-from fastapi import APIRouter, HTTPException, Request, status
+from fastapi import APIRouter, HTTPException, status
 
-from fastapi_example.models.input import InputData
+from fastapi_example.auth.dependencies import get_current_user
+from fastapi_example.models.input import MathOperation, MathResult
 from fastapi_example.workers.math_operations import (
     add_numbers,
     divide_numbers,
@@ -14,63 +16,47 @@ logger = logging.getLogger(__name__)
 
 math_router = APIRouter(tags=["math"], prefix="/math")
 
-
-@math_router.get("/add", status_code=200)
-def add(A: float, B: float, request: Request) -> dict:
-    user_info = request.state.user_info
-    user = user_info.get("sub")
-    logger.debug("User %s requesting add operation", user)
-    input_data = InputData(A=A, B=B)
-    result = add_numbers(input_data.A, input_data.B)
-    return {"operation": "add", "a": input_data.A, "b": input_data.B, "result": result}
-
-
-@math_router.get("/subtract", status_code=200)
-def subtract(A: float, B: float, request: Request) -> dict:
-    user_info = request.state.user_info
-    user = user_info.get("sub")
-    logger.debug("User %s requesting subtract operation", user)
-    input_data = InputData(A=A, B=B)
-    result = subtract_numbers(input_data.A, input_data.B)
-    return {
-        "operation": "subtract",
-        "a": input_data.A,
-        "b": input_data.B,
-        "result": result,
-    }
+OPERATIONS: dict[MathOperation, Callable[[float, float], float]] = {
+    MathOperation.add: add_numbers,
+    MathOperation.subtract: subtract_numbers,
+    MathOperation.multiply: multiply_numbers,
+    MathOperation.divide: divide_numbers,
+}
 
 
-@math_router.get("/multiply", status_code=200)
-def multiply(A: float, B: float, request: Request) -> dict:
-    user_info = request.state.user_info
+def _calculate(operation: MathOperation, A: float, B: float) -> MathResult:
+    user_info = get_current_user()
     user = user_info.get("sub")
-    logger.debug("User %s requesting multiply operation", user)
-    input_data = InputData(A=A, B=B)
-    result = multiply_numbers(input_data.A, input_data.B)
-    return {
-        "operation": "multiply",
-        "a": input_data.A,
-        "b": input_data.B,
-        "result": result,
-    }
-
-
-@math_router.get("/divide", status_code=200)
-def divide(A: float, B: float, request: Request) -> dict:
-    user_info = request.state.user_info
-    user = user_info.get("sub")
-    logger.debug("User %s requesting divide operation", user)
-    input_data = InputData(A=A, B=B)
+    logger.debug("User %s requesting %s operation", user, operation.value)
     try:
-        result = divide_numbers(input_data.A, input_data.B)
+        result = OPERATIONS[operation](A, B)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e),
         ) from e
     return {
-        "operation": "divide",
-        "a": input_data.A,
-        "b": input_data.B,
+        "operation": operation.value,
+        "a": A,
+        "b": B,
         "result": result,
     }
+
+
+def _add_operation_route(operation: MathOperation) -> None:
+    async def endpoint(A: float, B: float) -> MathResult:
+        return _calculate(operation, A, B)
+
+    # One route per operation keeps the per-op paths and operation_ids
+    # (e.g. add_math_add_get) stable for generated clients
+    math_router.add_api_route(
+        f"/{operation.value}",
+        endpoint,
+        methods=["GET"],
+        status_code=200,
+        name=operation.value,
+    )
+
+
+for _operation in MathOperation:
+    _add_operation_route(_operation)
@@ -26,7 +26,7 @@ oauth_router = APIRouter(tags=["oauth"], prefix="/auth/oauth")
 
 
 @oauth_router.get("/provider", status_code=200)
-def get_provider_info(
+async def get_provider_info(
     settings: Settings = _depends_settings,
 ) -> dict[str, str]:
     """Get the configured OAuth provider name."""
@@ -34,7 +34,7 @@ def get_provider_info(
 
 
 @oauth_router.post("/authorize", status_code=200)
-def get_authorization_url(
+async def get_authorization_url(
     request: AuthorizationRequest,
     settings: Settings = _depends_settings,
 ) -> dict[str, str]:
@@ -81,6 +81,7 @@ async def exchange_code_for_token(
     access_token = create_access_token(
         data={"sub": user_email, "provider": settings.oauth_provider},
         roles=user_roles,
+        settings=settings,
     )
 
     logger.info(
@@ -1,13 +1,22 @@
 import base64
 import json
+import sys
+from collections.abc import Mapping
 from functools import lru_cache
+from types import MappingProxyType
+from typing import NamedTuple
 
-from pydantic import model_validator
+from pydantic import PrivateAttr, model_validator
 from pydantic_settings import BaseSettings
 
 from fastapi_example.utils.auth_utils import hash_api_key
 
 
+class ApiKeyInfo(NamedTuple):
+    username: str | None
+    roles: tuple[str, ...]
+
+
 class Settings(BaseSettings):
     app_name: str = "fastapi_example"
     description: str = "fastapi_example api"
@@ -26,24 +35,34 @@ class Settings(BaseSettings):
         1440  # Set to 1 day by default (1440 minutes)
     )
 
+    # Read-only {hashed key: ApiKeyInfo} table built from api_keys
+    _api_key_infos: Mapping[bytes, ApiKeyInfo] = PrivateAttr(
+        default_factory=lambda: MappingProxyType({})
+    )
+
     @model_validator(mode="after")
     def process_api_keys(self) -> "Settings":
-        if isinstance(self.api_keys, str):
-            decoded = base64.b64decode(self.api_keys).decode()
-            self.api_keys = json.loads(decoded)
+        api_keys = self.api_keys
+        if isinstance(api_keys, str):
+            api_keys = json.loads(base64.b64decode(api_keys).decode())
 
-        api_key_list = list(self.api_keys.keys())
-        if len(api_key_list) != len(set(api_key_list)):
+        if len(api_keys) != len(set(api_keys)):
             raise ValueError("All Keys in 'api_keys' must be unique")
 
-        hashed_keys = {}
-        for key, value in self.api_keys.items():
-            hashed_key = hash_api_key(key)
-            hashed_keys[hashed_key] = value
-
-        self.api_keys = hashed_keys
+        self._api_key_infos = MappingProxyType(
+            {
+                hash_api_key(key): ApiKeyInfo(
+                    username=value.get("username"),
+                    roles=tuple(sys.intern(role) for role in value.get("roles", [])),
+                )
+                for key, value in api_keys.items()
+            }
+        )
         return self
 
+    def get_api_key_info(self, api_key: str) -> ApiKeyInfo | None:
+        return self._api_key_infos.get(hash_api_key(api_key))
+
     class Config:
         env_file = ".env"
         extra = "allow"
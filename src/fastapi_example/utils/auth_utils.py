@@ -1,19 +1,29 @@
 import hashlib
 
 
-def hash_api_key(api_key: str) -> str:
-    """Hash an API key using SHA256.
+def hash_api_key(api_key: str) -> bytes:
+    """Hash an API key using BLAKE2b.
 
     Args:
         api_key: The plain text API key to hash
 
     Returns:
-        The hashed API key as a hexadecimal string
+        The 16-byte BLAKE2b digest of the API key
     """
-    return hashlib.sha256(api_key.encode()).hexdigest()
+    return hashlib.blake2b(api_key.encode(), digest_size=16).digest()
 
 
-def get_user_roles(user_email: str) -> list[str]:
+# Role assignment criteria (customize as needed)
+# Example: admins are users from certain domains or specific emails
+ADMIN_DOMAINS = ("admin.com", "company.com")
+ADMIN_EMAILS = frozenset({"admin@example.com"})
+
+_ADMIN_EMAIL_SUFFIXES = tuple(f"@{domain}" for domain in ADMIN_DOMAINS)
+_DEFAULT_ROLES = ("user",)
+_ADMIN_ROLES = ("user", "admin")
+
+
+def get_user_roles(user_email: str) -> tuple[str, ...]:
     """Get roles for a user based on their email.
 
     This is a simple implementation that assigns roles based on email domain
@@ -24,19 +34,10 @@ def get_user_roles(user_email: str) -> list[str]:
         user_email: The user's email address
 
     Returns:
-        List of roles assigned to the user
+        Shared, immutable tuple of roles assigned to the user
     """
-    # Default role for all authenticated users
-    roles = ["user"]
+    if user_email in ADMIN_EMAILS or user_email.endswith(_ADMIN_EMAIL_SUFFIXES):
+        return _ADMIN_ROLES
 
-    # Add admin role for specific criteria (customize as needed)
-    # Example: admins are users from certain domains or specific emails
-    admin_domains = ["admin.com", "company.com"]
-    admin_emails = ["admin@example.com"]
-
-    if user_email in admin_emails or any(
-        user_email.endswith(f"@{domain}") for domain in admin_domains
-    ):
-        roles.append("admin")
-
-    return roles
+    # Default role for all authenticated users
+    return _DEFAULT_ROLES
@@ -1,22 +1,66 @@
 import logging
 from typing import Any
+from urllib.parse import quote, urlencode
 
 import httpx
 from fastapi import HTTPException, status
 
-from fastapi_example.auth.oauth_providers import OAUTH_PROVIDERS
+from fastapi_example.auth.oauth_providers import OAUTH_PROVIDERS, OAuthProvider
 
 logger = logging.getLogger(__name__)
 
+GITHUB_EMAILS_URL = "https://api.github.com/user/emails"
 
-def get_oauth_config(provider: str) -> dict[str, str]:
+# The provider set is fixed at import, so the static part of each authorization
+# query string is encoded once instead of on every /authorize call
+_STATIC_AUTHORIZATION_PARAMS = {
+    name: urlencode({"response_type": "code", "scope": config.scope}, quote_via=quote)
+    for name, config in OAUTH_PROVIDERS.items()
+}
+
+# Shared outbound client so provider connections (TCP + TLS) are reused across logins
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client used for OAuth provider calls.
+
+    HTTP/2 lets concurrent logins against the same provider share one
+    multiplexed connection instead of opening a new TLS session each.
+
+    Returns:
+        The process-wide AsyncClient, created on first use
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(10.0),
+            limits=httpx.Limits(
+                max_keepalive_connections=20,
+                max_connections=100,
+                keepalive_expiry=60.0,
+            ),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and release its pooled connections."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def get_oauth_config(provider: str) -> OAuthProvider:
     """Get OAuth configuration for a provider.
 
     Args:
         provider: The OAuth provider name (e.g., 'github', 'google')
 
     Returns:
-        Dictionary containing provider configuration
+        Provider configuration
 
     Raises:
         ValueError: If provider is not supported
@@ -44,13 +88,9 @@ def build_authorization_url(
     """
     oauth_config = get_oauth_config(provider)
 
-    return (
-        f"{oauth_config['authorization_url']}"
-        f"?client_id={client_id}"
-        f"&redirect_uri={redirect_uri}"
-        f"&response_type=code"
-        f"&scope={oauth_config['scope']}"
-    )
+    params = {"client_id": client_id, "redirect_uri": redirect_uri}
+    query = urlencode(params, quote_via=quote)
+    return f"{oauth_config.authorization_url}?{query}&{_STATIC_AUTHORIZATION_PARAMS[provider]}"
 
 
 async def exchange_code_for_provider_token(
@@ -85,21 +125,21 @@ async def exchange_code_for_provider_token(
         "grant_type": "authorization_code",
     }
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                oauth_config["token_url"],
-                data=token_data,
-                headers={"Accept": "application/json"},
-            )
-            response.raise_for_status()
-            oauth_tokens = response.json()
-        except httpx.HTTPError as e:
-            logger.error("Failed to exchange code for token: %s", e)
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to exchange authorization code",
-            ) from e
+    client = get_http_client()
+    try:
+        response = await client.post(
+            oauth_config.token_url,
+            data=token_data,
+            headers={"Accept": "application/json"},
+        )
+        response.raise_for_status()
+        oauth_tokens = response.json()
+    except httpx.HTTPError as e:
+        logger.error("Failed to exchange code for token: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to exchange authorization code",
+        ) from e
 
     provider_access_token = oauth_tokens.get("access_token")
     if not provider_access_token:
@@ -129,48 +169,39 @@ async def get_user_info_from_provider(
     """
     oauth_config = get_oauth_config(provider)
 
-    async with httpx.AsyncClient() as client:
-        try:
-            user_response = await client.get(
-                oauth_config["userinfo_url"],
-                headers={"Authorization": f"Bearer {provider_access_token}"},
+    client = get_http_client()
+    headers = {"Authorization": f"Bearer {provider_access_token}"}
+    try:
+        user_response = await client.get(oauth_config.userinfo_url, headers=headers)
+        user_response.raise_for_status()
+        user_info = user_response.json()
+
+        # GitHub-specific: /user omits private emails, so only then ask /user/emails
+        if provider == "github" and not user_info.get("email"):
+            emails_response = await client.get(GITHUB_EMAILS_URL, headers=headers)
+            emails_response.raise_for_status()
+            emails = emails_response.json()
+
+            # Find the primary email or the first verified email
+            primary_email = next(
+                (e["email"] for e in emails if e.get("primary") and e.get("verified")),
+                None,
             )
-            user_response.raise_for_status()
-            user_info = user_response.json()
-
-            # GitHub-specific: if email is not in user info, fetch from /user/emails
-            if provider == "github" and not user_info.get("email"):
-                emails_response = await client.get(
-                    "https://api.github.com/user/emails",
-                    headers={"Authorization": f"Bearer {provider_access_token}"},
-                )
-                emails_response.raise_for_status()
-                emails = emails_response.json()
-
-                # Find the primary email or the first verified email
+            if not primary_email:
                 primary_email = next(
-                    (
-                        e["email"]
-                        for e in emails
-                        if e.get("primary") and e.get("verified")
-                    ),
-                    None,
+                    (e["email"] for e in emails if e.get("verified")), None
                 )
-                if not primary_email:
-                    primary_email = next(
-                        (e["email"] for e in emails if e.get("verified")), None
-                    )
-
-                if primary_email:
-                    user_info["email"] = primary_email
-
-            return user_info
-        except httpx.HTTPError as e:
-            logger.error("Failed to get user info: %s", e)
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to retrieve user information",
-            ) from e
+
+            if primary_email:
+                user_info["email"] = primary_email
+
+        return user_info
+    except httpx.HTTPError as e:
+        logger.error("Failed to get user info: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to retrieve user information",
+        ) from e
 
 
 def extract_user_email(user_info: dict[str, Any]) -> str:
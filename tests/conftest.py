@@ -1,11 +1,23 @@
+from datetime import timedelta
+
 import pytest
 from fastapi.testclient import TestClient
 
+from fastapi_example.auth import oauth_auth
+from fastapi_example.auth.oauth_auth import create_access_token
 from fastapi_example.main import app
 from fastapi_example.settings import Settings, get_settings
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def clear_failed_tokens():
+    """Keep the rejected-token cache from leaking between tests."""
+    oauth_auth._failed_tokens.clear()
+    yield
+    oauth_auth._failed_tokens.clear()
+
+
+@pytest.fixture(scope="session")
 def test_api_keys():
     """Sample API keys for testing."""
     return {
@@ -14,7 +26,7 @@ def test_api_keys():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_settings(test_api_keys):
     """Override settings for testing."""
 
@@ -28,7 +40,7 @@ def test_settings(test_api_keys):
     return TestSettings()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def override_settings(test_settings):
     """Override the get_settings dependency."""
     # Clear the lru_cache to ensure fresh settings
@@ -39,10 +51,11 @@ def override_settings(test_settings):
     get_settings.cache_clear()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client(override_settings):
-    """FastAPI test client with overridden settings."""
-    return TestClient(app)
+    """FastAPI test client with overridden settings, shared across the session."""
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 @pytest.fixture
@@ -57,13 +70,46 @@ def user_headers():
     return {"Authorization": "Bearer test_user_key"}
 
 
+@pytest.fixture(scope="session")
+def oauth_token(test_settings):
+    """OAuth access token with the 'user' role, signed once per session."""
+    return create_access_token(
+        {"sub": "test@example.com", "provider": "github"},
+        roles=["user"],
+        settings=test_settings,
+    )
+
+
+@pytest.fixture(scope="session")
+def oauth_headers(oauth_token):
+    """Headers with an OAuth bearer token."""
+    return {"Authorization": f"Bearer {oauth_token}"}
+
+
+@pytest.fixture(scope="session")
+def expired_token(test_settings):
+    """OAuth access token that expired one second after being issued."""
+    return create_access_token(
+        {"sub": "test@example.com", "provider": "github"},
+        expires_delta=timedelta(seconds=-1),
+        roles=["user"],
+        settings=test_settings,
+    )
+
+
+@pytest.fixture(scope="session")
+def invalid_token():
+    """Bearer token that is not a valid JWT."""
+    return "invalid_token"
+
+
 @pytest.fixture
 def invalid_headers():
     """Headers with invalid API key."""
     return {"Authorization": "Bearer invalid_key"}
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_input_data():
     """Sample input data for math operations."""
     return {"A": 10.0, "B": 5.0}
@@ -1,22 +1,36 @@
-from datetime import timedelta
+import hmac
+import time
+from datetime import datetime, timedelta
 
+import jwt
 import pytest
 from fastapi import HTTPException
 
+from fastapi_example.auth import oauth_auth
 from fastapi_example.auth.oauth_auth import (
     create_access_token,
     get_oauth_config,
     verify_access_token,
 )
+from fastapi_example.settings import ApiKeyInfo, Settings
+from fastapi_example.utils.auth_utils import get_user_roles, hash_api_key
 
 
 def test_get_oauth_config():
     config = get_oauth_config()
-    assert "authorization_url" in config
-    assert "token_url" in config
-    assert "userinfo_url" in config
-    assert "scope" in config
-    assert "github.com" in config["authorization_url"]
+    assert config.authorization_url
+    assert config.token_url
+    assert config.userinfo_url
+    assert config.scope
+    assert "github.com" in config.authorization_url
+
+
+def test_get_oauth_config_follows_settings(test_settings, monkeypatch):
+    google_settings = test_settings.model_copy(update={"oauth_provider": "google"})
+    monkeypatch.setattr(oauth_auth, "get_settings", lambda: google_settings)
+    assert get_oauth_config().authorization_url.startswith(
+        "https://accounts.google.com/"
+    )
 
 
 def test_create_access_token():
@@ -26,26 +40,98 @@ def test_create_access_token():
     assert len(token) > 0
 
 
-def test_verify_access_token_success():
-    data = {"sub": "test@example.com", "provider": "github"}
-    token = create_access_token(data)
-    payload = verify_access_token(token)
+def test_verify_access_token_success(oauth_token, test_settings):
+    payload = verify_access_token(oauth_token, test_settings)
     assert payload["sub"] == "test@example.com"
     assert payload["provider"] == "github"
 
 
-def test_verify_access_token_expired():
-    data = {"sub": "test@example.com"}
-    token = create_access_token(data, expires_delta=timedelta(seconds=-1))
-
+@pytest.mark.parametrize(
+    ("token_fixture", "detail"),
+    [("expired_token", "Token has expired"), ("invalid_token", "Invalid token")],
+)
+def test_verify_access_token_rejected(request, test_settings, token_fixture, detail):
+    token = request.getfixturevalue(token_fixture)
     with pytest.raises(HTTPException) as exc_info:
-        verify_access_token(token)
+        verify_access_token(token, test_settings)
     assert exc_info.value.status_code == 401
-    assert "expired" in exc_info.value.detail.lower()
+    assert exc_info.value.detail == detail
 
 
-def test_verify_access_token_invalid():
+def test_verify_access_token_caches_failures(monkeypatch):
+    token = "cached.invalid.token"
+    with pytest.raises(HTTPException):
+        verify_access_token(token)
+
+    def fail_decode(*_args, **_kwargs):
+        raise AssertionError("rejected token should not be decoded again")
+
+    monkeypatch.setattr(jwt, "decode", fail_decode)
     with pytest.raises(HTTPException) as exc_info:
-        verify_access_token("invalid_token")
+        verify_access_token(token)
     assert exc_info.value.status_code == 401
     assert "Invalid token" in exc_info.value.detail
+
+
+def test_verify_access_token_compares_signature_in_constant_time(
+    oauth_token, test_settings, monkeypatch
+):
+    calls = []
+    compare_digest = hmac.compare_digest
+
+    def recording_compare_digest(a, b):
+        calls.append((a, b))
+        return compare_digest(a, b)
+
+    monkeypatch.setattr(hmac, "compare_digest", recording_compare_digest)
+    verify_access_token(oauth_token, test_settings)
+    assert calls
+
+
+def test_verify_access_token_does_not_cache_immature_tokens(monkeypatch):
+    token = create_access_token(
+        {"sub": "test@example.com", "nbf": int(time.time()) + 60}
+    )
+    with pytest.raises(HTTPException) as exc_info:
+        verify_access_token(token)
+    assert exc_info.value.detail == "Invalid token"
+
+    class _Later(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.now(tz) + timedelta(minutes=2)
+
+    monkeypatch.setattr(jwt.api_jwt, "datetime", _Later)
+    payload = verify_access_token(token)
+    assert payload["sub"] == "test@example.com"
+
+
+def test_create_access_token_sets_integer_expiry():
+    token = create_access_token({"sub": "test@example.com"}, timedelta(minutes=5))
+    payload = verify_access_token(token)
+    assert isinstance(payload["exp"], int)
+    assert 0 < payload["exp"] - time.time() <= 300
+
+
+def test_get_user_roles():
+    assert get_user_roles("someone@example.com") == ("user",)
+    assert get_user_roles("admin@example.com") == ("user", "admin")
+    assert get_user_roles("boss@company.com") == ("user", "admin")
+    assert get_user_roles("boss@notcompany.com") == ("user",)
+
+
+def test_api_key_lookup(test_settings):
+    key_info = test_settings.get_api_key_info("test_admin_key")
+    assert key_info == ApiKeyInfo(username="test_admin", roles=("admin", "user"))
+    assert test_settings.get_api_key_info("unknown_key") is None
+
+    with pytest.raises(TypeError):
+        test_settings._api_key_infos[hash_api_key("new_key")] = key_info
+
+
+def test_settings_serialization_round_trip(test_settings):
+    test_settings.model_dump_json()
+    restored = Settings(**test_settings.model_dump())
+    assert restored.get_api_key_info("test_user_key") == ApiKeyInfo(
+        username="test_user", roles=("user",)
+    )
@@ -1,52 +1,124 @@
-def test_get_authorization_url_github(client):
-    request_data = {"redirect_uri": "http://localhost/callback"}
-    response = client.post("/auth/oauth/authorize", json=request_data)
+import asyncio
+from urllib.parse import urlsplit
 
-    assert response.status_code == 200
-    data = response.json()
-    assert "authorization_url" in data
-    assert "github.com" in data["authorization_url"]
+import httpx
+import pytest
+from fastapi import HTTPException
 
+from fastapi_example.auth.oauth_providers import OAUTH_PROVIDERS
+from fastapi_example.main import app
+from fastapi_example.settings import get_settings
+from fastapi_example.workers import oauth_service
 
-def test_exchange_code_for_token_success(client, monkeypatch):
-    from unittest.mock import MagicMock
+GITHUB = OAUTH_PROVIDERS["github"]
+AUTHORIZE_URL = httpx.URL("/auth/oauth/authorize")
+TOKEN_URL = httpx.URL("/auth/oauth/token")
 
-    import httpx
 
-    # Mock the AsyncClient
-    mock_token_response = MagicMock()
-    mock_token_response.json.return_value = {"access_token": "mock_provider_token"}
-    mock_token_response.raise_for_status = MagicMock()
+@pytest.fixture
+def provider_responses(monkeypatch):
+    """Route provider HTTP calls to canned JSON bodies (or exceptions) keyed by URL."""
+    responses = {
+        GITHUB.token_url: {"access_token": "mock_provider_token"},
+        GITHUB.userinfo_url: {"email": "test@example.com"},
+        oauth_service.GITHUB_EMAILS_URL: [],
+    }
 
-    mock_user_response = MagicMock()
-    mock_user_response.json.return_value = {"email": "test@example.com"}
-    mock_user_response.raise_for_status = MagicMock()
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = responses[str(request.url)]
+        if isinstance(body, Exception):
+            raise body
+        return httpx.Response(200, json=body)
 
-    async def mock_post(*_args, **_kwargs):
-        return mock_token_response
+    transport = httpx.MockTransport(handler)
+    http_client = httpx.AsyncClient(transport=transport)
+    monkeypatch.setattr(oauth_service, "get_http_client", lambda: http_client)
+    yield responses
+    asyncio.run(http_client.aclose())
 
-    async def mock_get(*_args, **_kwargs):
-        return mock_user_response
 
-    class MockAsyncClient:
-        async def __aenter__(self):
-            return self
+@pytest.mark.parametrize(
+    ("provider", "host"),
+    [("github", "github.com"), ("google", "accounts.google.com")],
+)
+def test_get_authorization_url(client, test_settings, monkeypatch, provider, host):
+    provider_settings = test_settings.model_copy(update={"oauth_provider": provider})
+    monkeypatch.setitem(
+        app.dependency_overrides, get_settings, lambda: provider_settings
+    )
 
-        async def __aexit__(self, *args):
-            pass
+    request_data = {"redirect_uri": "http://localhost/callback"}
+    response = client.post(AUTHORIZE_URL, json=request_data)
 
-        post = mock_post
-        get = mock_get
+    assert response.status_code == 200
+    assert urlsplit(response.json()["authorization_url"]).netloc == host
 
-    monkeypatch.setattr(httpx, "AsyncClient", MockAsyncClient)
 
+def test_exchange_code_for_token_success(client, provider_responses):
     request_data = {
         "code": "test_code",
         "redirect_uri": "http://localhost/callback",
     }
-    response = client.post("/auth/oauth/token", json=request_data)
+    response = client.post(TOKEN_URL, json=request_data)
 
     assert response.status_code == 200
     data = response.json()
     assert "access_token" in data
     assert data["token_type"] == "bearer"
+
+
+def test_http_client_is_shared_until_closed(monkeypatch):
+    # Start from no client so the one owned by the app lifespan is left alone
+    monkeypatch.setattr(oauth_service, "_http_client", None)
+    client = oauth_service.get_http_client()
+    assert oauth_service.get_http_client() is client
+
+    asyncio.run(oauth_service.close_http_client())
+    assert client.is_closed
+    assert oauth_service.get_http_client() is not client
+    asyncio.run(oauth_service.close_http_client())
+
+
+def test_get_user_info_github_private_email(provider_responses):
+    provider_responses[GITHUB.userinfo_url] = {"login": "octocat", "email": None}
+    provider_responses[oauth_service.GITHUB_EMAILS_URL] = [
+        {"email": "other@example.com", "primary": False, "verified": True},
+        {"email": "octocat@example.com", "primary": True, "verified": True},
+    ]
+
+    user_info = asyncio.run(oauth_service.get_user_info_from_provider("github", "tok"))
+    assert user_info["email"] == "octocat@example.com"
+
+
+def test_get_user_info_github_public_email_skips_emails(provider_responses):
+    provider_responses[oauth_service.GITHUB_EMAILS_URL] = httpx.ConnectTimeout(
+        "timed out"
+    )
+
+    user_info = asyncio.run(oauth_service.get_user_info_from_provider("github", "tok"))
+    assert user_info["email"] == "test@example.com"
+
+
+def test_build_authorization_url_encodes_params():
+    auth_url = oauth_service.build_authorization_url(
+        provider="google",
+        client_id="client id",
+        redirect_uri="http://localhost/callback?next=/a&b=1",
+    )
+    assert auth_url == (
+        "https://accounts.google.com/o/oauth2/v2/auth"
+        "?client_id=client%20id"
+        "&redirect_uri=http%3A%2F%2Flocalhost%2Fcallback%3Fnext%3D%2Fa%26b%3D1"
+        "&response_type=code"
+        "&scope=openid%20email%20profile"
+    )
+
+
+def test_extract_user_email():
+    extract = oauth_service.extract_user_email
+    assert extract({"email": "a@example.com"}) == "a@example.com"
+    assert extract({"email": None, "mail": "b@example.com"}) == "b@example.com"
+
+    with pytest.raises(HTTPException) as exc_info:
+        extract({"preferred_username": "c@example.com"})
+    assert exc_info.value.status_code == 400
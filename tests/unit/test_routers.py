@@ -1,3 +1,15 @@
+import httpx
+
+from fastapi_example.auth import dependencies
+from fastapi_example.auth.oauth_auth import create_access_token
+from fastapi_example.main import app
+
+ADD_URL = httpx.URL("/math/add")
+SUBTRACT_URL = httpx.URL("/math/subtract")
+MULTIPLY_URL = httpx.URL("/math/multiply")
+DIVIDE_URL = httpx.URL("/math/divide")
+
+
 def test_root_redirect(client):
     response = client.get("/")
     assert response.status_code == 200
@@ -6,7 +18,7 @@ def test_root_redirect(client):
 
 def test_add_endpoint_success(client, admin_headers, sample_input_data):
     response = client.get(
-        "/math/add",
+        ADD_URL,
         params=sample_input_data,
         headers=admin_headers,
     )
@@ -18,7 +30,7 @@ def test_add_endpoint_success(client, admin_headers, sample_input_data):
 
 def test_subtract_endpoint_success(client, admin_headers, sample_input_data):
     response = client.get(
-        "/math/subtract",
+        SUBTRACT_URL,
         params=sample_input_data,
         headers=admin_headers,
     )
@@ -30,7 +42,7 @@ def test_subtract_endpoint_success(client, admin_headers, sample_input_data):
 
 def test_multiply_endpoint_success(client, admin_headers, sample_input_data):
     response = client.get(
-        "/math/multiply",
+        MULTIPLY_URL,
         params=sample_input_data,
         headers=admin_headers,
     )
@@ -42,7 +54,7 @@ def test_multiply_endpoint_success(client, admin_headers, sample_input_data):
 
 def test_divide_endpoint_success(client, admin_headers, sample_input_data):
     response = client.get(
-        "/math/divide",
+        DIVIDE_URL,
         params=sample_input_data,
         headers=admin_headers,
     )
@@ -55,7 +67,7 @@ def test_divide_endpoint_success(client, admin_headers, sample_input_data):
 def test_divide_by_zero_endpoint(client, admin_headers):
     input_data = {"A": 10.0, "B": 0.0}
     response = client.get(
-        "/math/divide",
+        DIVIDE_URL,
         params=input_data,
         headers=admin_headers,
     )
@@ -64,7 +76,7 @@ def test_divide_by_zero_endpoint(client, admin_headers):
 
 def test_endpoint_without_auth(client, sample_input_data):
     response = client.get(
-        "/math/add",
+        ADD_URL,
         params=sample_input_data,
         follow_redirects=False,
     )
@@ -74,7 +86,7 @@ def test_endpoint_without_auth(client, sample_input_data):
 
 def test_endpoint_with_invalid_auth(client, invalid_headers, sample_input_data):
     response = client.get(
-        "/math/add",
+        ADD_URL,
         params=sample_input_data,
         headers=invalid_headers,
         follow_redirects=False,
@@ -86,7 +98,7 @@ def test_endpoint_with_invalid_auth(client, invalid_headers, sample_input_data):
 def test_user_can_access_endpoint(client, user_headers, sample_input_data):
     """Test that users with 'user' role can access endpoints."""
     response = client.get(
-        "/math/add",
+        ADD_URL,
         params=sample_input_data,
         headers=user_headers,
     )
@@ -94,3 +106,93 @@ def test_user_can_access_endpoint(client, user_headers, sample_input_data):
     data = response.json()
     assert data["operation"] == "add"
     assert data["result"] == 15.0
+
+
+def test_oauth_token_can_access_endpoint(client, oauth_headers, sample_input_data):
+    """Test that OAuth tokens are verified with the injected settings."""
+    response = client.get(
+        ADD_URL,
+        params=sample_input_data,
+        headers=oauth_headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["result"] == 15.0
+
+
+def test_oauth_endpoint_with_expired_token(client, expired_token, sample_input_data):
+    response = client.get(
+        ADD_URL,
+        params=sample_input_data,
+        headers={"Authorization": f"Bearer {expired_token}"},
+        follow_redirects=False,
+    )
+    assert response.status_code == 307
+    assert response.headers["Location"] == "/static/"
+
+
+def test_invalid_api_key_skips_oauth_verification(
+    client, invalid_headers, sample_input_data, monkeypatch
+):
+    """Test that tokens which are not JWT-shaped never reach JWT verification."""
+
+    def fail_verify(*_args, **_kwargs):
+        raise AssertionError("non-JWT token should not be verified as OAuth")
+
+    monkeypatch.setattr(dependencies, "verify_access_token", fail_verify)
+    response = client.get(
+        ADD_URL,
+        params=sample_input_data,
+        headers=invalid_headers,
+        follow_redirects=False,
+    )
+    assert response.status_code == 307
+
+
+def test_endpoint_with_non_bearer_scheme(client, sample_input_data):
+    response = client.get(
+        ADD_URL,
+        params=sample_input_data,
+        headers={"Authorization": "Basic test_admin_key"},
+        follow_redirects=False,
+    )
+    assert response.status_code == 307
+    assert response.headers["Location"] == "/static/"
+
+
+def test_oauth_token_without_required_role(client, test_settings, sample_input_data):
+    """Test that OAuth users lacking a required role are forbidden."""
+    token = create_access_token(
+        {"sub": "test@example.com", "provider": "github"},
+        roles=["guest"],
+        settings=test_settings,
+    )
+    response = client.get(
+        ADD_URL,
+        params=sample_input_data,
+        headers={"Authorization": f"Bearer {token}"},
+        follow_redirects=False,
+    )
+    assert response.status_code == 403
+
+
+def test_unknown_operation(client, admin_headers, sample_input_data):
+    response = client.get(
+        "/math/modulo",
+        params=sample_input_data,
+        headers=admin_headers,
+    )
+    assert response.status_code == 404
+
+
+def test_math_operation_ids_are_per_operation():
+    operation_ids = {
+        path: operation["get"]["operationId"]
+        for path, operation in app.openapi()["paths"].items()
+        if path.startswith("/math/")
+    }
+    assert operation_ids == {
+        "/math/add": "add_math_add_get",
+        "/math/subtract": "subtract_math_subtract_get",
+        "/math/multiply": "multiply_math_multiply_get",
+        "/math/divide": "divide_math_divide_get",
+    }